@@ -2,15 +2,13 @@
 # AI Joke Generator - Powered by Ollama
 
 import sys
+from importlib.util import find_spec
 
 
 def check_deps():
-    missing = []
-    for pkg, name in [("requests", "requests"), ("gtts", "gtts"), ("dotenv", "python-dotenv")]:
-        try:
-            __import__(pkg)
-        except ImportError:
-            missing.append(name)
+    # find_spec only locates the packages; importing them here would slow down startup
+    missing = [name for pkg, name in [("requests", "requests"), ("gtts", "gtts"), ("dotenv", "python-dotenv")]
+               if find_spec(pkg) is None]
 
     if missing:
         print("Missing packages:", ", ".join(missing))
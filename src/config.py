@@ -1,12 +1,20 @@
-from pathlib import Path
-from dotenv import load_dotenv
+import os
 
-load_dotenv(Path(__file__).parent.parent / ".env")
+# Parse .env at most once per process, even if this module is reloaded.
+# Set USE_DOTENV=0 to skip it entirely when the environment is already set.
+if os.environ.get("USE_DOTENV", "1") == "1" and not os.environ.get("_JOKE_GENERATOR_ENV_LOADED"):
+    from pathlib import Path
+    from dotenv import load_dotenv
 
-# Ollama settings
-OLLAMA_BASE_URL = "http://localhost:11434"
-OLLAMA_MODEL = "llama3.2"
-REQUEST_TIMEOUT = 60
+    load_dotenv(Path(__file__).parent.parent / ".env")
+    os.environ["_JOKE_GENERATOR_ENV_LOADED"] = "1"
+
+# Ollama settings (read from the environment once, at import)
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "llama3.2")
+REQUEST_TIMEOUT = int(os.environ.get("REQUEST_TIMEOUT", "60"))
+# How long Ollama keeps the model loaded after each request (Ollama's own default is 5m)
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
 
 GENERATION_CONFIG = {
     "temperature": 0.9,
@@ -16,6 +24,10 @@ GENERATION_CONFIG = {
 
 # App settings
 SUPPORTED_LANGUAGES = {"English": "en", "Romanian": "ro"}
-TTS_LANGUAGES = {"English": "en", "Romanian": "ro"}
-JOKE_TONES = ["Clean", "Dark", "Sarcastic"]
+TTS_LANGUAGES = SUPPORTED_LANGUAGES
+# "auto" speaks with the offline pyttsx3 engine when it is installed, otherwise gTTS
+TTS_BACKEND = os.environ.get("TTS_BACKEND", "auto")
+JOKE_TONES = ("Clean", "Dark", "Sarcastic")
+JOKE_TONES_SET = frozenset(JOKE_TONES)
+SUPPORTED_LANGUAGE_NAMES = frozenset(SUPPORTED_LANGUAGES)
 MIN_JOKES, MAX_JOKES, DEFAULT_JOKES = 1, 10, 3
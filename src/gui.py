@@ -1,8 +1,11 @@
 # GUI for AI Joke Generator
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, List
 
 from . import config
@@ -13,6 +16,29 @@ from .tts_engine import TTSEngine, TTSEngineError
 from .stt_engine import STTEngine, STTEngineError
 
 
+# Option values shown in the UI, taken from config so they can't drift
+LANGUAGES = tuple(config.SUPPORTED_LANGUAGES)
+_SAVE_FILETYPES = (("Text files", "*.txt"),)
+
+
+# Tcl lambda that rewrites a read-only Text widget in one interpreter call.
+# The text is passed as an argument, so it never needs Tcl quoting.
+_REPLACE_READONLY_TCL = "{w text} {$w configure -state normal; $w replace 1.0 end $text; $w configure -state disabled}"
+_APPEND_READONLY_TCL = "{w text} {$w configure -state normal; $w insert end $text; $w configure -state disabled; $w see end}"
+
+
+# Users often regenerate with the same context, so skip re-validating/re-analyzing it.
+# Results are shared between calls and must be treated as read-only.
+@lru_cache(maxsize=64)
+def _cached_validate(context: str) -> tuple[bool, str]:
+    return utils.validate_context(context)
+
+
+@lru_cache(maxsize=64)
+def _cached_analyze(context: str) -> dict:
+    return text_processing.analyze_input(context)
+
+
 # Modern color scheme and styling
 class ModernStyle:
     # Colors - Dark modern theme
@@ -38,17 +64,81 @@ class ModernStyle:
     FONT_MONO = ("Courier", 11)
     FONT_SMALL = ("Helvetica", 9)
 
+    # Shared tk.Button options, see JokeGeneratorApp._make_button
+    BUTTON_PRIMARY = MappingProxyType({
+        "font": FONT_BUTTON, "bg": ACCENT, "fg": BG_DARK, "activebackground": ACCENT_HOVER,
+        "relief": "flat", "cursor": "hand2", "padx": 15, "pady": 5})
+    BUTTON_SECONDARY = MappingProxyType({
+        "font": FONT_BUTTON, "bg": BG_INPUT, "fg": TEXT_PRIMARY,
+        "relief": "flat", "cursor": "hand2", "padx": 12, "pady": 5})
+    # Display-only Text widgets: no undo history, no cursor blink, no X selection export
+    READONLY_TEXT = MappingProxyType({
+        "undo": False, "autoseparators": False, "insertofftime": 0, "exportselection": False})
+
+    # Scale value -> label text
+    JOKE_COUNT_LABELS = tuple(str(n) for n in range(config.MAX_JOKES + 1))
+
+    # ttk style name -> configure() options
+    STYLE_SPECS = (
+        ("Card.TFrame", {"background": BG_CARD}),
+        ("Dark.TFrame", {"background": BG_DARK}),
+        ("Title.TLabel", {"background": BG_DARK, "foreground": TEXT_PRIMARY, "font": FONT_TITLE}),
+        ("Subtitle.TLabel", {"background": BG_DARK, "foreground": TEXT_SECONDARY, "font": FONT_SUBTITLE}),
+        ("Card.TLabel", {"background": BG_CARD, "foreground": TEXT_PRIMARY, "font": FONT_BODY}),
+        ("CardHeading.TLabel", {"background": BG_CARD, "foreground": TEXT_PRIMARY, "font": FONT_HEADING}),
+        ("Status.TLabel", {"background": BG_DARK, "foreground": TEXT_SECONDARY, "font": FONT_SMALL}),
+        ("Success.TLabel", {"background": BG_CARD, "foreground": SUCCESS, "font": FONT_BODY}),
+        ("Error.TLabel", {"background": BG_CARD, "foreground": ERROR, "font": FONT_BODY}),
+        ("ErrorBanner.TLabel", {"background": BG_DARK, "foreground": ERROR, "font": FONT_SMALL}),
+        ("Modern.Horizontal.TScale", {"background": BG_CARD, "troughcolor": BG_INPUT}),
+        ("Modern.TRadiobutton", {"background": BG_CARD, "foreground": TEXT_PRIMARY, "font": FONT_BODY}),
+    )
+
+    @classmethod
+    def style_script(cls) -> str:
+        def word(value):
+            if isinstance(value, tuple):
+                return "{" + " ".join(str(v) for v in value) + "}"
+            return str(value)
+
+        return "\n".join(
+            f"ttk::style configure {name} " + " ".join(f"-{k} {word(v)}" for k, v in options.items())
+            for name, options in cls.STYLE_SPECS)
+
+    # ttk style name -> map() options
+    STYLE_MAPS = (
+        ("Modern.TRadiobutton", {"background": [("active", BG_CARD)]}),
+    )
+
 
 class JokeGeneratorApp:
 
+    ANALYSIS_TEMPLATE = ("Words: {word_count}  |  Characters: {character_count}  |  "
+                         "Language: {language} ({confidence:.0%})  |  Keywords: {keywords}")
+    GENERATED_TEMPLATE = "Generated {count} joke(s)"
+    DEFAULT_CONTEXT = "school, exams, programming"
+    REDRAW_INTERVAL_MS = 33
+    STATUS_INTERVAL_MS = 50
+
     def __init__(self, root: tk.Tk):
         self.root = root
         self.joke_generator: Optional[JokeGenerator] = None
-        self.tts_engine: Optional[TTSEngine] = None
-        self.stt_engine: Optional[STTEngine] = None
         self.current_jokes: List[str] = []
         self.current_language = "English"
         self.is_generating = False
+        # Last text written to the analysis/output widgets, to skip identical rewrites
+        self._last_report = ""
+        self._last_output = ""
+        # Context the analysis panel currently describes; None until the first run
+        self._analyzed_context: Optional[str] = None
+        self._error_after_id = None
+        self._pending_jokes: List[str] = []
+        # Jokes currently drawn in output_text, kept until a new run diverges from them
+        self._shown_jokes: tuple = ()
+        self._flush_after_id = None
+        self._cancel_requested = False
+        # Short CPU-bound work (analysis) reuses one worker; blocking I/O gets daemon threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="joke")
 
         self._setup_window()
         self._setup_styles()
@@ -58,85 +148,61 @@ class JokeGeneratorApp:
 
     def _setup_window(self):
         self.root.title("AI Joke Generator")
-        self.root.geometry("700x800")
         self.root.minsize(500, 600)
         self.root.configure(bg=ModernStyle.BG_DARK)
 
-        self.root.update_idletasks()
+        # Screen size is known without flushing idle tasks, and the window size is fixed
         x = (self.root.winfo_screenwidth() - 700) // 2
         y = (self.root.winfo_screenheight() - 800) // 2
         self.root.geometry(f"700x800+{x}+{y}")
 
     def _setup_styles(self):
         self.style = ttk.Style()
-        self.style.theme_use('clam')
-
-        self.style.configure("Card.TFrame", background=ModernStyle.BG_CARD)
-        self.style.configure("Dark.TFrame", background=ModernStyle.BG_DARK)
-
-        self.style.configure("Title.TLabel",
-            background=ModernStyle.BG_DARK,
-            foreground=ModernStyle.TEXT_PRIMARY,
-            font=ModernStyle.FONT_TITLE)
-
-        self.style.configure("Subtitle.TLabel",
-            background=ModernStyle.BG_DARK,
-            foreground=ModernStyle.TEXT_SECONDARY,
-            font=ModernStyle.FONT_SUBTITLE)
-
-        self.style.configure("Card.TLabel",
-            background=ModernStyle.BG_CARD,
-            foreground=ModernStyle.TEXT_PRIMARY,
-            font=ModernStyle.FONT_BODY)
-
-        self.style.configure("CardHeading.TLabel",
-            background=ModernStyle.BG_CARD,
-            foreground=ModernStyle.TEXT_PRIMARY,
-            font=ModernStyle.FONT_HEADING)
 
-        self.style.configure("Status.TLabel",
-            background=ModernStyle.BG_DARK,
-            foreground=ModernStyle.TEXT_SECONDARY,
-            font=ModernStyle.FONT_SMALL)
-
-        self.style.configure("Success.TLabel",
-            background=ModernStyle.BG_CARD,
-            foreground=ModernStyle.SUCCESS,
-            font=ModernStyle.FONT_BODY)
-
-        self.style.configure("Error.TLabel",
-            background=ModernStyle.BG_CARD,
-            foreground=ModernStyle.ERROR,
-            font=ModernStyle.FONT_BODY)
-
-        self.style.configure("Modern.Horizontal.TScale",
-            background=ModernStyle.BG_CARD,
-            troughcolor=ModernStyle.BG_INPUT)
+        # Styles live in the Tcl interpreter, so a second app on the same root can skip this.
+        # A class-level flag would be wrong here: every tk.Tk() gets a fresh interpreter.
+        if self.style.lookup("Card.TFrame", "background") == ModernStyle.BG_CARD:
+            return
 
-        self.style.configure("Modern.TRadiobutton",
-            background=ModernStyle.BG_CARD,
-            foreground=ModernStyle.TEXT_PRIMARY,
-            font=ModernStyle.FONT_BODY)
+        self.style.theme_use('clam')
 
-        self.style.map("Modern.TRadiobutton",
-            background=[("active", ModernStyle.BG_CARD)])
+        # All configure calls go to Tcl as one script; fall back to one call per style
+        try:
+            self.root.tk.eval(ModernStyle.style_script())
+        except tk.TclError:
+            for name, options in ModernStyle.STYLE_SPECS:
+                self.style.configure(name, **options)
+        for name, options in ModernStyle.STYLE_MAPS:
+            self.style.map(name, **options)
 
     def _init_services(self):
+        # TTS/STT engines are created on first use, see the properties below
+        self._tts_engine: Optional[TTSEngine] = None
+        self._tts_failed = False
+        self._stt_engine: Optional[STTEngine] = None
+        self._stt_starting = False
         self.stt_error_msg = None
 
-        try:
-            self.tts_engine = TTSEngine()
-        except TTSEngineError:
-            self.tts_engine = None
+        self.joke_generator = None
 
-        try:
-            self.stt_engine = STTEngine()
-        except STTEngineError as e:
-            self.stt_error_msg = str(e)
-            print(f"STT not available: {e}")
-            self.stt_engine = None
+    @property
+    def tts_engine(self) -> Optional[TTSEngine]:
+        if self._tts_engine is None and not self._tts_failed:
+            try:
+                self._tts_engine = TTSEngine()
+            except TTSEngineError:
+                self._tts_failed = True
+        return self._tts_engine
 
-        self.joke_generator = None
+    @property
+    def stt_engine(self) -> Optional[STTEngine]:
+        if self._stt_engine is None and self.stt_error_msg is None:
+            try:
+                self._stt_engine = STTEngine()
+            except STTEngineError as e:
+                self.stt_error_msg = str(e)
+                print(f"STT not available: {e}")
+        return self._stt_engine
 
     def _create_widgets(self):
         # Create canvas with scrollbar
@@ -151,32 +217,71 @@ class JokeGeneratorApp:
         self.main_frame = ttk.Frame(self.canvas, style="Dark.TFrame")
         self.canvas_frame = self.canvas.create_window((0, 0), window=self.main_frame, anchor="nw")
 
-        self.main_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        self._scrollregion_after_id = None
+        self.main_frame.bind("<Configure>", self._schedule_scrollregion)
         self.canvas.bind("<Configure>", self._on_canvas_resize)
 
         # Mousewheel scrolling
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
-        self.canvas.bind_all("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
-        self.canvas.bind_all("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
-
-        # Build UI sections
-        self._create_header()
-        self._create_connection_section()
-        self._create_input_section()
-        self._create_options_section()
-        self._create_output_section()
-        self._create_analysis_section()
-        self._create_footer()
+        self.canvas.bind_all("<Button-4>", lambda e: self._scroll_page(e, -1))
+        self.canvas.bind_all("<Button-5>", lambda e: self._scroll_page(e, 1))
+
+        # Created up front so status updates work before the footer is built
+        self.status_var = tk.StringVar(value="Ready - Click 'Connect' to start")
+        # Text shown in the footer, and the newest text waiting for the next flush
+        self._last_status = self.status_var.get()
+        self._pending_status = self._last_status
+        self._status_after_id = None
+
+        # Build UI sections one idle callback at a time so the window paints early
+        self._build_in_stages([
+            self._create_header,
+            self._create_connection_section,
+            self._create_input_section,
+            self._create_options_section,
+            self._create_output_section,
+            self._create_analysis_section,
+            self._create_footer,
+        ])
+
+    def _build_in_stages(self, stages: list):
+        stages[0]()
+        if len(stages) > 1:
+            self.root.after_idle(self._build_in_stages, stages[1:])
+        else:
+            self.root.update_idletasks()
+            self.root.after(1000, self._preload_save_dialog)
+
+    def _preload_save_dialog(self):
+        # On X11 the save dialog is a Tcl script sourced on first use; load it while idle
+        try:
+            self.root.tk.call("auto_load", "::tk::dialog::file::")
+        except tk.TclError:
+            pass
+
+    def _schedule_scrollregion(self, event=None):
+        # Resizes fire <Configure> in bursts; re-measure the canvas once per 20 ms
+        if self._scrollregion_after_id:
+            self.root.after_cancel(self._scrollregion_after_id)
+        self._scrollregion_after_id = self.root.after(20, self._apply_scrollregion)
+
+    def _apply_scrollregion(self):
+        self._scrollregion_after_id = None
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
 
     def _on_canvas_resize(self, event):
         self.canvas.itemconfig(self.canvas_frame, width=event.width)
 
     def _on_mousewheel(self, event):
-        if event.delta:
-            if abs(event.delta) < 10:
-                self.canvas.yview_scroll(int(-1 * event.delta), "units")
-            else:
-                self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+        delta = event.delta
+        if delta:
+            # macOS reports small raw deltas, Windows multiples of 120
+            self._scroll_page(event, int(-delta if abs(delta) < 10 else -delta / 120))
+
+    def _scroll_page(self, event, units: int):
+        # Text widgets scroll themselves; don't drag the whole page along with them
+        if not isinstance(event.widget, tk.Text):
+            self.canvas.yview_scroll(units, "units")
 
     def _create_header(self):
         header = ttk.Frame(self.main_frame, style="Dark.TFrame")
@@ -195,12 +300,7 @@ class JokeGeneratorApp:
         self.connection_status = ttk.Label(row, text="Not connected", style="Error.TLabel")
         self.connection_status.pack(side="left")
 
-        self.connect_btn = tk.Button(row, text="Connect",
-            font=ModernStyle.FONT_BUTTON,
-            bg=ModernStyle.ACCENT, fg=ModernStyle.BG_DARK,
-            activebackground=ModernStyle.ACCENT_HOVER,
-            relief="flat", cursor="hand2", padx=15, pady=5,
-            command=self._connect_ollama)
+        self.connect_btn = self._make_button(row, "Connect", self._connect_ollama, primary=True)
         self.connect_btn.pack(side="right")
 
         ttk.Label(card, text=f"Model: {config.OLLAMA_MODEL}",
@@ -217,77 +317,68 @@ class JokeGeneratorApp:
             highlightthickness=1, highlightbackground=ModernStyle.BORDER,
             highlightcolor=ModernStyle.ACCENT)
         self.context_text.pack(fill="x")
-        self.context_text.insert("1.0", "school, exams, programming")
+        self.context_text.insert("1.0", self.DEFAULT_CONTEXT)
+
+        # Keep a stripped copy of the context, refreshed only when the text changes
+        self._context_cache = self.DEFAULT_CONTEXT
+        self.context_text.edit_modified(False)
+        self.context_text.bind("<<Modified>>", self._on_context_modified)
 
         mic_row = ttk.Frame(card, style="Card.TFrame")
         mic_row.pack(fill="x", pady=(8, 0))
 
-        self.mic_btn = tk.Button(mic_row, text="🎤 Voice Input",
-            font=ModernStyle.FONT_BUTTON,
-            bg=ModernStyle.BG_INPUT, fg=ModernStyle.TEXT_PRIMARY,
-            activebackground=ModernStyle.ACCENT,
-            relief="flat", cursor="hand2", padx=12, pady=5,
-            command=self._start_recording)
+        self.mic_btn = self._make_button(mic_row, "🎤 Voice Input", self._start_recording,
+            activebackground=ModernStyle.ACCENT)
         self.mic_btn.pack(side="left")
 
         self.mic_status = ttk.Label(mic_row, text="", style="Card.TLabel")
         self.mic_status.pack(side="left", padx=(10, 0))
 
-        if not self.stt_engine:
-            self.mic_btn.config(state="disabled", bg=ModernStyle.TEXT_MUTED, text="🎤 Voice Input (Unavailable)")
-            self.mic_btn.bind("<Button-1>", lambda e: self._show_stt_error())
-
     def _create_options_section(self):
         card = self._create_card("Options")
 
+        # One grid row: Jokes: [scale] n | Language: (o) (o) | Tone: [combo]
         options_row = ttk.Frame(card, style="Card.TFrame")
         options_row.pack(fill="x")
+        options_row.columnconfigure(1, weight=1)
 
         # Number of jokes
-        jokes_frame = ttk.Frame(options_row, style="Card.TFrame")
-        jokes_frame.pack(side="left", fill="x", expand=True)
-
-        ttk.Label(jokes_frame, text="Jokes:", style="Card.TLabel").pack(side="left")
+        ttk.Label(options_row, text="Jokes:", style="Card.TLabel").grid(row=0, column=0)
         self.num_jokes_var = tk.IntVar(value=3)
-        self.num_jokes_scale = ttk.Scale(jokes_frame, from_=1, to=10,
-            orient="horizontal", variable=self.num_jokes_var,
-            command=self._update_jokes_label)
-        self.num_jokes_scale.pack(side="left", fill="x", expand=True, padx=5)
-        self.num_jokes_label = ttk.Label(jokes_frame, text="3", style="Card.TLabel", width=2)
-        self.num_jokes_label.pack(side="left")
+        num_jokes_scale = ttk.Scale(options_row, from_=1, to=10,
+            orient="horizontal", variable=self.num_jokes_var)
+        num_jokes_scale.grid(row=0, column=1, sticky="ew", padx=5)
+        self.num_jokes_label = ttk.Label(options_row, text="3", style="Card.TLabel", width=2)
+        self.num_jokes_label.grid(row=0, column=2)
+        self._shown_num_jokes = 3
+        self.num_jokes_var.trace_add("write", self._update_jokes_label)
 
         # Language
-        lang_frame = ttk.Frame(options_row, style="Card.TFrame")
-        lang_frame.pack(side="left", padx=(20, 0))
-
-        ttk.Label(lang_frame, text="Language:", style="Card.TLabel").pack(side="left")
+        ttk.Label(options_row, text="Language:", style="Card.TLabel").grid(row=0, column=3, padx=(20, 0))
         self.language_var = tk.StringVar(value="English")
-        for lang in ["English", "Romanian"]:
-            ttk.Radiobutton(lang_frame, text=lang, value=lang,
-                variable=self.language_var, style="Modern.TRadiobutton").pack(side="left", padx=3)
+        for col, lang in enumerate(LANGUAGES, start=4):
+            ttk.Radiobutton(options_row, text=lang, value=lang,
+                variable=self.language_var, style="Modern.TRadiobutton").grid(row=0, column=col, padx=3)
 
         # Tone
-        tone_frame = ttk.Frame(options_row, style="Card.TFrame")
-        tone_frame.pack(side="left", padx=(20, 0))
-
-        ttk.Label(tone_frame, text="Tone:", style="Card.TLabel").pack(side="left")
+        ttk.Label(options_row, text="Tone:", style="Card.TLabel").grid(row=0, column=6, padx=(20, 0))
         self.tone_var = tk.StringVar(value="Clean")
-        self.tone_combo = ttk.Combobox(tone_frame, textvariable=self.tone_var,
-            values=["Clean", "Dark", "Sarcastic"], state="readonly", width=10)
-        self.tone_combo.pack(side="left", padx=5)
+        tone_combo = ttk.Combobox(options_row, textvariable=self.tone_var,
+            values=config.JOKE_TONES, state="readonly", width=10)
+        tone_combo.grid(row=0, column=7, padx=5)
 
         # Generate button
         btn_frame = ttk.Frame(card, style="Card.TFrame")
         btn_frame.pack(fill="x", pady=(15, 0))
 
-        self.generate_btn = tk.Button(btn_frame, text="Generate Jokes",
-            font=ModernStyle.FONT_BUTTON,
-            bg=ModernStyle.ACCENT, fg=ModernStyle.BG_DARK,
-            activebackground=ModernStyle.ACCENT_HOVER,
-            relief="flat", cursor="hand2", padx=20, pady=8,
-            command=self._generate_jokes)
+        self.generate_btn = self._make_button(btn_frame, "Generate Jokes", self._generate_jokes,
+            primary=True, padx=20, pady=8)
         self.generate_btn.pack(side="left")
 
+        self.cancel_btn = self._make_button(btn_frame, "Cancel", self._cancel_generation,
+            state="disabled", pady=8)
+        self.cancel_btn.pack(side="left", padx=(5, 0))
+
     def _create_output_section(self):
         card = self._create_card("Generated Jokes")
 
@@ -297,31 +388,22 @@ class JokeGeneratorApp:
             insertbackground=ModernStyle.TEXT_PRIMARY,
             relief="flat", wrap="word", padx=10, pady=10,
             highlightthickness=1, highlightbackground=ModernStyle.BORDER,
-            state="disabled")
+            state="disabled", **ModernStyle.READONLY_TEXT)
         self.output_text.pack(fill="both", expand=True)
 
         btn_frame = ttk.Frame(card, style="Card.TFrame")
         btn_frame.pack(fill="x", pady=(10, 0))
 
-        btn_style = {"font": ModernStyle.FONT_BUTTON, "bg": ModernStyle.BG_INPUT,
-                     "fg": ModernStyle.TEXT_PRIMARY, "relief": "flat",
-                     "cursor": "hand2", "padx": 12, "pady": 5}
-
-        self.speak_btn = tk.Button(btn_frame, text="Read Aloud", state="disabled",
-            command=self._speak_jokes, **btn_style)
+        self.speak_btn = self._make_button(btn_frame, "Read Aloud", self._speak_jokes, state="disabled")
         self.speak_btn.pack(side="left", padx=(0, 5))
 
-        self.stop_btn = tk.Button(btn_frame, text="Stop", state="disabled",
-            command=self._stop_speaking, **btn_style)
+        self.stop_btn = self._make_button(btn_frame, "Stop", self._stop_speaking, state="disabled")
         self.stop_btn.pack(side="left", padx=(0, 5))
 
-        self.save_btn = tk.Button(btn_frame, text="Save", state="disabled",
-            command=self._save_jokes, **btn_style)
+        self.save_btn = self._make_button(btn_frame, "Save", self._save_jokes, state="disabled")
         self.save_btn.pack(side="left")
 
-        self.clear_btn = tk.Button(btn_frame, text="Clear",
-            command=self._clear_output, **btn_style)
-        self.clear_btn.pack(side="right")
+        self._make_button(btn_frame, "Clear", self._clear_output).pack(side="right")
 
     def _create_analysis_section(self):
         card = self._create_card("Text Analysis")
@@ -330,34 +412,39 @@ class JokeGeneratorApp:
             font=ModernStyle.FONT_SMALL,
             bg=ModernStyle.BG_INPUT, fg=ModernStyle.TEXT_PRIMARY,
             relief="flat", wrap="word", padx=10, pady=8,
-            state="disabled")
+            state="disabled", **ModernStyle.READONLY_TEXT)
         self.analysis_text.pack(fill="x")
 
-    def _create_card(self, title: str) -> ttk.Frame:
-        outer = ttk.Frame(self.main_frame, style="Dark.TFrame")
-        outer.pack(fill="x", padx=20, pady=(0, 10))
-
-        card = ttk.Frame(outer, style="Card.TFrame")
-        card.pack(fill="x")
+    def _make_button(self, parent, text: str, command, primary: bool = False, **overrides) -> tk.Button:
+        base = ModernStyle.BUTTON_PRIMARY if primary else ModernStyle.BUTTON_SECONDARY
+        return tk.Button(parent, text=text, command=command, **{**base, **overrides})
 
-        inner = ttk.Frame(card, style="Card.TFrame")
-        inner.pack(fill="x", padx=15, pady=12)
+    def _create_card(self, title: str) -> ttk.Frame:
+        # One frame per card; ttk padding gives the inset that used to need two nested frames
+        card = ttk.Frame(self.main_frame, style="Card.TFrame", padding=(15, 12))
+        card.pack(fill="x", padx=20, pady=(0, 10))
 
-        ttk.Label(inner, text=title, style="CardHeading.TLabel").pack(anchor="w", pady=(0, 10))
+        ttk.Label(card, text=title, style="CardHeading.TLabel").pack(anchor="w", pady=(0, 10))
 
-        return inner
+        return card
 
     def _create_footer(self):
         footer = ttk.Frame(self.main_frame, style="Dark.TFrame")
         footer.pack(fill="x", padx=20, pady=(5, 20))
 
-        self.status_var = tk.StringVar(value="Ready - Click 'Connect' to start")
         ttk.Label(footer, textvariable=self.status_var, style="Status.TLabel").pack(side="left")
 
+        # Packed only while an error is showing, see _show_error
+        self.error_banner = ttk.Label(footer, style="ErrorBanner.TLabel", wraplength=380, justify="right")
+
     # Event handlers
 
-    def _update_jokes_label(self, value):
-        self.num_jokes_label.config(text=str(int(float(value))))
+    def _update_jokes_label(self, *_):
+        # The scale writes a fractional value on every pixel of a drag; redraw only when the count changes
+        value = self.num_jokes_var.get()
+        if value != self._shown_num_jokes:
+            self._shown_num_jokes = value
+            self.num_jokes_label.config(text=ModernStyle.JOKE_COUNT_LABELS[value])
 
     def _connect_ollama(self):
         self._set_status("Connecting to Ollama...")
@@ -365,12 +452,18 @@ class JokeGeneratorApp:
 
         def connect():
             try:
-                self.joke_generator = JokeGenerator()
+                generator = JokeGenerator()
+                old, self.joke_generator = self.joke_generator, generator
+                # Each generator pools its own connections; release the replaced one's
+                if old:
+                    old.close()
                 self.root.after(0, self._on_connect_success)
+                # Load the model now so the first Generate doesn't pay for it
+                generator.warmup()
             except JokeGeneratorError as e:
                 self.root.after(0, lambda: self._on_connect_error(str(e)))
 
-        threading.Thread(target=connect, daemon=True).start()
+        self._run_in_background(connect)
 
     def _on_connect_success(self):
         self.connection_status.config(text="Connected", style="Success.TLabel")
@@ -381,71 +474,136 @@ class JokeGeneratorApp:
         self.connection_status.config(text="Not connected", style="Error.TLabel")
         self.connect_btn.config(state="normal")
         self._set_status("Connection failed")
-        messagebox.showerror("Ollama Error", error)
+        self._show_error(error)
 
     def _generate_jokes(self):
         if not self.joke_generator:
-            messagebox.showerror("Error", "Please connect to Ollama first.")
+            self._show_error("Please connect to Ollama first.")
             return
 
         if self.is_generating:
             return
 
-        context = self.context_text.get("1.0", "end").strip()
+        context = self._context_cache
         num_jokes = int(self.num_jokes_var.get())
         language = self.language_var.get()
         tone = self.tone_var.get()
 
-        is_valid, error = utils.validate_context(context)
+        is_valid, error = _cached_validate(context)
         if not is_valid:
-            messagebox.showerror("Invalid Input", error)
+            self._show_error(error)
             return
 
-        analysis = text_processing.analyze_input(context)
-        self._update_analysis(analysis)
+        # Analysis runs beside the generation worker; only the redraw comes back to Tk
+        if context != self._analyzed_context:
+            self._analyzed_context = context
+            self._executor.submit(
+                lambda: self.root.after(0, self._update_analysis, _cached_analyze(context)))
 
         self.current_language = language
+        self.current_jokes = []
         self.is_generating = True
         self.generate_btn.config(state="disabled", bg=ModernStyle.BG_INPUT)
+        self.cancel_btn.config(state="normal")
+        self._cancel_requested = False
+        self.speak_btn.config(state="disabled")
+        self.save_btn.config(state="disabled")
         self._set_status("Generating jokes...")
 
         def generate():
-            result = self.joke_generator.generate_jokes(
-                context=context, num_jokes=num_jokes,
-                language=language, tone=tone)
-            self.root.after(0, lambda: self._on_generation_complete(result))
+            error = None
+            try:
+                jokes = self.joke_generator.stream_jokes(
+                    context=context, num_jokes=num_jokes,
+                    language=language, tone=tone)
+                # Cancel may have been clicked before the stream's cancel event existed
+                if self._cancel_requested:
+                    self.joke_generator.cancel()
+                for joke in jokes:
+                    self.root.after(0, self._enqueue_joke, joke)
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            finally:
+                self.root.after(0, self._on_generation_complete, error)
+
+        self._run_in_background(generate)
+
+    def _enqueue_joke(self, joke: str):
+        # Streamed jokes are buffered and drawn at most ~30 times a second
+        self._pending_jokes.append(joke)
+        if not self._flush_after_id:
+            self._flush_after_id = self.root.after(self.REDRAW_INTERVAL_MS, self._flush_jokes)
+
+    def _flush_jokes(self):
+        if self._flush_after_id:
+            self.root.after_cancel(self._flush_after_id)
+            self._flush_after_id = None
+        if not self._pending_jokes:
+            return
 
-        threading.Thread(target=generate, daemon=True).start()
+        start = len(self.current_jokes)
+        jokes = self.current_jokes + self._pending_jokes
+        pending, self._pending_jokes = self._pending_jokes, []
+        self.current_jokes = jokes
 
-    def _on_generation_complete(self, result: dict):
+        # A regenerated joke identical to the one on screen needs no redraw
+        if tuple(jokes) == self._shown_jokes[:len(jokes)]:
+            return
+        if start and len(self._shown_jokes) == start:
+            self._append_output("\n\n" + utils.format_jokes_for_display(pending, start=start + 1))
+        else:
+            self._set_output(utils.format_jokes_for_display(jokes))
+        self._shown_jokes = tuple(jokes)
+
+    def _on_generation_complete(self, error: Optional[str]):
+        self._flush_jokes()
+        # Drop leftovers from the previous run if this one produced fewer jokes
+        if len(self._shown_jokes) > len(self.current_jokes):
+            self._set_output(utils.format_jokes_for_display(self.current_jokes) if self.current_jokes else "")
+            self._shown_jokes = tuple(self.current_jokes)
         self.is_generating = False
         self.generate_btn.config(state="normal", bg=ModernStyle.ACCENT)
+        self.cancel_btn.config(state="disabled")
 
-        if result["success"]:
-            self.current_jokes = result["jokes"]
-            formatted = utils.format_jokes_for_display(result["jokes"])
-            self._set_output(formatted)
-            self._set_status(f"Generated {len(result['jokes'])} joke(s)")
+        if self.current_jokes:
             self.speak_btn.config(state="normal" if self.tts_engine else "disabled")
             self.save_btn.config(state="normal")
-        else:
-            self._set_output(f"Error: {result['error']}")
+
+        if self._cancel_requested:
+            self._set_status("Generation cancelled")
+        elif error:
+            if not self.current_jokes:
+                self._set_output(f"Error: {error}")
             self._set_status("Generation failed")
-            messagebox.showerror("Error", result["error"])
+            self._show_error(error)
+        else:
+            self._set_status(self.GENERATED_TEMPLATE.format_map({"count": len(self.current_jokes)}))
 
-    def _update_analysis(self, analysis: dict):
-        self.analysis_text.config(state="normal")
-        self.analysis_text.delete("1.0", "end")
+    def _cancel_generation(self):
+        if not self.is_generating:
+            return
+        self._cancel_requested = True
+        self.cancel_btn.config(state="disabled")
+        self._set_status("Cancelling...")
+        self.joke_generator.cancel()
 
+    def _update_analysis(self, analysis: dict):
+        report = ""
         if analysis["is_valid"] and analysis["statistics"]:
             stats = analysis["statistics"]
-            report = (f"Words: {stats['word_count']}  |  "
-                     f"Characters: {stats['character_count']}  |  "
-                     f"Language: {stats['detected_language'].upper()} ({stats['language_confidence']:.0%})  |  "
-                     f"Keywords: {', '.join(stats['keywords'][:4])}")
-            self.analysis_text.insert("1.0", report)
+            report = self.ANALYSIS_TEMPLATE.format_map({
+                "word_count": stats["word_count"],
+                "character_count": stats["character_count"],
+                "language": stats["detected_language"].upper(),
+                "confidence": stats["language_confidence"],
+                "keywords": ", ".join(stats["keywords"][:4]),
+            })
+
+        if report == self._last_report:
+            return
+        self._last_report = report
 
-        self.analysis_text.config(state="disabled")
+        self._replace_readonly(self.analysis_text, report)
 
     def _speak_jokes(self):
         if not self.tts_engine or not self.current_jokes:
@@ -459,11 +617,11 @@ class JokeGeneratorApp:
             try:
                 text = utils.format_jokes_for_tts(self.current_jokes)
                 self.tts_engine.set_language(self.current_language)
-                self.tts_engine.play(text, on_complete=lambda: self.root.after(0, self._on_speech_complete))
+                self.tts_engine.play_stream(text, on_complete=lambda: self.root.after(0, self._on_speech_complete))
             except TTSEngineError:
                 self.root.after(0, self._on_speech_complete)
 
-        threading.Thread(target=speak, daemon=True).start()
+        self._run_in_background(speak)
 
     def _on_speech_complete(self):
         self.speak_btn.config(state="normal")
@@ -481,11 +639,11 @@ class JokeGeneratorApp:
 
         filepath = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt")],
+            filetypes=_SAVE_FILETYPES,
             title="Save Jokes")
 
         if filepath:
-            context = self.context_text.get("1.0", "end").strip()
+            context = self._context_cache
             success, result = utils.save_jokes_to_file(
                 self.current_jokes, filepath, context, self.current_language)
 
@@ -493,7 +651,7 @@ class JokeGeneratorApp:
                 self._set_status(f"Saved to {result}")
                 messagebox.showinfo("Success", f"Saved to:\n{result}")
             else:
-                messagebox.showerror("Error", result)
+                self._show_error(result)
 
     def _clear_output(self):
         self._set_output("")
@@ -503,16 +661,65 @@ class JokeGeneratorApp:
         self._set_status("Ready")
 
     def _set_output(self, text: str):
-        self.output_text.config(state="normal")
-        self.output_text.delete("1.0", "end")
-        self.output_text.insert("1.0", text)
-        self.output_text.config(state="disabled")
+        self._shown_jokes = ()
+        if text == self._last_output:
+            return
+        self._last_output = text
+        self._replace_readonly(self.output_text, text)
+
+    def _append_output(self, text: str):
+        # Only the new text is laid out; the existing buffer is left alone
+        self._last_output = None
+        self.output_text.tk.call("apply", _APPEND_READONLY_TCL, str(self.output_text), text)
+
+    def _replace_readonly(self, widget: tk.Text, text: str):
+        widget.tk.call("apply", _REPLACE_READONLY_TCL, str(widget), text)
+
+    def _show_error(self, message: str, ms: int = 5000):
+        # Inline and non-modal, so background after() callbacks keep running
+        if self._error_after_id:
+            self.root.after_cancel(self._error_after_id)
+        self.error_banner.config(text=message)
+        self.error_banner.pack(side="right")
+        self._error_after_id = self.root.after(ms, self._hide_error)
+
+    def _hide_error(self):
+        self._error_after_id = None
+        self.error_banner.pack_forget()
 
     def _set_status(self, message: str):
-        self.status_var.set(message)
+        # The first message shows at once; any that follow within 50 ms collapse into one redraw
+        self._pending_status = message
+        if not self._status_after_id:
+            self._flush_status()
+
+    def _flush_status(self):
+        # Setting the same text still fires the variable trace and a label redraw
+        if self._pending_status != self._last_status:
+            self._last_status = self._pending_status
+            self.status_var.set(self._last_status)
+            self._status_after_id = self.root.after(self.STATUS_INTERVAL_MS, self._flush_status)
+        else:
+            self._status_after_id = None
 
     def _start_recording(self):
-        if not self.stt_engine or self.stt_engine.is_listening:
+        if self._stt_starting:
+            return
+
+        if self._stt_engine is None and self.stt_error_msg is None:
+            # First use: probing the microphone can block, so build the engine off the UI thread
+            self._stt_starting = True
+            self.mic_status.config(text="Starting microphone...")
+            self._run_in_background(self._bootstrap_stt)
+            return
+
+        if not self.stt_engine:
+            self.mic_btn.config(state="disabled", bg=ModernStyle.TEXT_MUTED, text="🎤 Voice Input (Unavailable)")
+            self.mic_btn.bind("<Button-1>", lambda e: self._show_stt_error())
+            self._show_stt_error()
+            return
+
+        if self.stt_engine.is_listening:
             return
 
         self.mic_btn.config(bg=ModernStyle.ERROR, text="🎤 Listening...")
@@ -526,17 +733,32 @@ class JokeGeneratorApp:
             on_error=lambda err: self.root.after(0, lambda: self._on_stt_error(err))
         )
 
+    def _bootstrap_stt(self):
+        try:
+            self.stt_engine  # builds the engine, or records why it's unavailable
+        except Exception as e:
+            self.stt_error_msg = f"Microphone setup failed: {e}"
+        finally:
+            self.root.after(0, self._on_stt_ready)
+
+    def _on_stt_ready(self):
+        self._stt_starting = False
+        self.mic_status.config(text="")
+        self._start_recording()
+
+    def _on_context_modified(self, event=None):
+        if self.context_text.edit_modified():
+            self._context_cache = self.context_text.get("1.0", "end").strip()
+            self.context_text.edit_modified(False)
+
     def _on_stt_result(self, text: str):
         self.mic_btn.config(bg=ModernStyle.BG_INPUT, text="🎤 Voice Input")
         self.mic_status.config(text="")
 
-        current = self.context_text.get("1.0", "end").strip()
-        if current and current != "school, exams, programming":
-            self.context_text.delete("1.0", "end")
-            self.context_text.insert("1.0", f"{current}, {text}")
-        else:
-            self.context_text.delete("1.0", "end")
-            self.context_text.insert("1.0", text)
+        current = self._context_cache
+        new_text = f"{current}, {text}" if current and current != self.DEFAULT_CONTEXT else text
+        self.context_text.replace("1.0", "end", new_text)
+        self._context_cache = new_text.strip()
 
         self._set_status(f"Heard: \"{text}\"")
 
@@ -556,9 +778,20 @@ class JokeGeneratorApp:
                 "2. PyAudio installed (pip install pyaudio)\n"
                 "3. Granted microphone permissions")
 
+    @staticmethod
+    def _run_in_background(target):
+        # Daemon threads, so a stream or request still blocking on Ollama can't keep the app alive after close
+        threading.Thread(target=target, daemon=True).start()
+
     def _on_close(self):
-        if self.tts_engine:
-            self.tts_engine.cleanup()
+        if self.joke_generator:
+            self.joke_generator.cancel()
+            self.joke_generator.close()
+        if self._tts_engine:
+            self._tts_engine.cleanup()
+        if self._stt_engine:
+            self._stt_engine.stop()
+        self._executor.shutdown(wait=False, cancel_futures=True)
         self.root.destroy()
 
 
@@ -1,8 +1,52 @@
 # Joke generation using Ollama local LLM
 
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
 from . import config
 from . import prompts
+from . import text_processing
+
+# orjson is optional; it encodes/decodes the Ollama JSON several times faster than json
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# base_url -> (fetched_at, model names) from /api/tags, shared across instances
+_TAG_CACHE: dict[str, tuple[float, frozenset[str]]] = {}
+_TAG_CACHE_TTL = 30.0
+_TAG_CACHE_LOCK = threading.Lock()
+
+# A new joke starts after a blank line or on a line beginning with a digit or '-'
+_JOKE_BREAK_RE = re.compile(r"\n[^\S\n]*\n|\n(?=[^\S\n]*[\d-])")
+# Whitespace around line breaks, trimmed so each line of a joke is stripped
+_LINE_EDGE_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+
+# Token budget per request scales with the jokes asked for, capped by GENERATION_CONFIG
+_TOKENS_PER_JOKE = 80
+_OVERHEAD_TOKENS = 40
+# Matches the adapter's pool_maxsize, so every concurrent call gets a pooled connection
+_MAX_CONCURRENT = 8
+# Successful generate_jokes results kept per instance, keyed on everything sent to the model
+_RESPONSE_CACHE_SIZE = 128
+
+# Connection errors and timeouts on the POST itself are retried with full-jitter backoff
+_POST_ATTEMPTS = 3
+_BACKOFF_BASE = 0.25
+_BACKOFF_CAP = 2.0
 
 
 class JokeGeneratorError(Exception):
@@ -11,20 +55,78 @@ class JokeGeneratorError(Exception):
 
 class JokeGenerator:
 
-    def __init__(self):
+    def __init__(self, cache_enabled: bool = True):
         self.base_url = config.OLLAMA_BASE_URL
         self.model = config.OLLAMA_MODEL
+        self.timeout = config.REQUEST_TIMEOUT
+        # Limits bound once so building a prompt doesn't go back through the config module
+        self._joke_range = (config.MIN_JOKES, config.MAX_JOKES)
+        self._languages = config.SUPPORTED_LANGUAGE_NAMES
+        self._tones = config.JOKE_TONES_SET
+
+        # One keep-alive connection pool for the tag check and every generation
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_MAX_CONCURRENT, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"})
+
+        # Constant part of every /api/generate body; only prompt and stream change per call
+        self._base_payload = {"model": self.model, "keep_alive": config.OLLAMA_KEEP_ALIVE,
+                              "options": dict(config.GENERATION_CONFIG)}
+        self._max_tokens = config.GENERATION_CONFIG["num_predict"]
+
+        # Streaming response being read, so cancel() can close it from another thread
+        self._current_response = None
+        # Replaced for each stream, so a cancel that arrives after one ends can't stop the next
+        self._cancelled = threading.Event()
+
+        self.cache_enabled = cache_enabled
+        self._cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._cache_lock = threading.Lock()
         self._check_ollama()
 
+    def close(self):
+        self.session.close()
+
+    def cancel(self):
+        # Closing the socket unblocks a worker waiting on a slow or stalled stream
+        self._cancelled.set()
+        resp = self._current_response
+        if resp is not None:
+            resp.close()
+
+    def warmup(self):
+        # An empty prompt makes Ollama load the model without generating anything
+        try:
+            self.session.post(f"{self.base_url}/api/generate",
+                              data=_dumps({**self._base_payload, "prompt": "", "stream": False}),
+                              timeout=self.timeout).close()
+        except requests.exceptions.RequestException:
+            pass
+
     def _check_ollama(self):
+        # A recent successful check is reused (e.g. on Reconnect); a missing model is always re-checked
+        with _TAG_CACHE_LOCK:
+            cached = _TAG_CACHE.get(self.base_url)
+            if cached and time.monotonic() - cached[0] < _TAG_CACHE_TTL and self.model in cached[1]:
+                return
+
+            models = self._fetch_models()
+            _TAG_CACHE[self.base_url] = (time.monotonic(), models)
+
+        if self.model not in models:
+            raise JokeGeneratorError(f"Model '{self.model}' not found. Run: ollama pull {self.model}")
+
+    def _fetch_models(self) -> frozenset[str]:
         try:
-            resp = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            resp = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             if resp.status_code != 200:
                 raise JokeGeneratorError("Ollama not responding. Run: ollama serve")
 
-            models = [m.get("name", "").split(":")[0] for m in resp.json().get("models", [])]
-            if self.model not in models:
-                raise JokeGeneratorError(f"Model '{self.model}' not found. Run: ollama pull {self.model}")
+            # Both "name:tag" and bare "name", so either form of OLLAMA_MODEL is a set lookup
+            names = {m.get("name", "") for m in _loads(resp.content).get("models", [])}
+            return frozenset(names | {n.split(":")[0] for n in names})
 
         except requests.exceptions.ConnectionError:
             raise JokeGeneratorError("Cannot connect to Ollama. Run: ollama serve")
@@ -36,32 +138,19 @@ class JokeGenerator:
         if not context or not context.strip():
             return {"success": False, "jokes": [], "raw_response": "", "error": "Context cannot be empty."}
 
-        num_jokes = max(config.MIN_JOKES, min(num_jokes, config.MAX_JOKES))
-        language = language if language in config.SUPPORTED_LANGUAGES else "English"
-        tone = tone if tone in config.JOKE_TONES else "Clean"
-
-        prompt = prompts.build(context, num_jokes, language, tone)
+        prompt, num_jokes = self._build_prompt(context, num_jokes, language, tone)
+        key = self._cache_key(context, num_jokes, language, tone)
+        cached = self._cache_get(key)
+        if cached:
+            return cached
 
         try:
-            resp = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": config.GENERATION_CONFIG["temperature"],
-                        "top_p": config.GENERATION_CONFIG["top_p"],
-                        "num_predict": config.GENERATION_CONFIG["num_predict"],
-                    }
-                },
-                timeout=config.REQUEST_TIMEOUT
-            )
+            resp = self._post_with_retry(self._payload(prompt, num_jokes, stream=False), stream=False)
 
             if resp.status_code != 200:
                 return {"success": False, "jokes": [], "raw_response": "", "error": f"Ollama error: {resp.status_code}"}
 
-            raw_text = resp.json().get("response", "")
+            raw_text = _loads(resp.content).get("response", "")
             if not raw_text:
                 return {"success": False, "jokes": [], "raw_response": "", "error": "Empty response from Ollama."}
 
@@ -69,7 +158,9 @@ class JokeGenerator:
             if len(jokes) > num_jokes:
                 jokes = jokes[:num_jokes]
 
-            return {"success": True, "jokes": jokes, "raw_response": raw_text, "error": None}
+            result = {"success": True, "jokes": jokes, "raw_response": raw_text, "error": None}
+            self._cache_put(key, result)
+            return result
 
         except requests.exceptions.ConnectionError:
             return {"success": False, "jokes": [], "raw_response": "", "error": "Lost connection to Ollama."}
@@ -78,31 +169,217 @@ class JokeGenerator:
         except Exception as e:
             return {"success": False, "jokes": [], "raw_response": "", "error": str(e)}
 
-    def _parse_jokes(self, raw_text: str) -> list[str]:
+    def _cache_key(self, context: str, num_jokes: int, language: str, tone: str) -> tuple:
+        options = self._base_payload["options"]
+        # Contexts differing only in case or spacing share an entry
+        return (self.model, language, tone, num_jokes, text_processing.context_key(context),
+                options["temperature"], options["top_p"], self._num_predict(num_jokes))
+
+    def _cache_get(self, key: tuple) -> Optional[dict]:
+        if not self.cache_enabled:
+            return None
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if not cached:
+                return None
+            self._cache.move_to_end(key)
+        return {**cached, "jokes": list(cached["jokes"])}
+
+    def _cache_put(self, key: tuple, result: dict):
+        if not self.cache_enabled:
+            return
+        with self._cache_lock:
+            self._cache[key] = {**result, "jokes": list(result["jokes"])}
+            if len(self._cache) > _RESPONSE_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def generate_many(self, contexts: list[str], num_jokes: int = 3,
+                      language: str = "English", tone: str = "Clean") -> list[dict]:
+        # Requests overlap on the pooled session; results keep the order of contexts
+        if len(contexts) < 2:
+            return [self.generate_jokes(c, num_jokes, language, tone) for c in contexts]
+
+        with ThreadPoolExecutor(max_workers=min(len(contexts), _MAX_CONCURRENT)) as pool:
+            return list(pool.map(lambda c: self.generate_jokes(c, num_jokes, language, tone), contexts))
+
+    def generate_jokes_batch(self, contexts: list[str], num_jokes: int = 3,
+                             language: str = "English", tone: str = "Clean") -> list[dict]:
+        # One request for every context; if the reply can't be split per context, ask one by one
+        if len(contexts) < 2 or not all(c and c.strip() for c in contexts):
+            return self.generate_many(contexts, num_jokes, language, tone)
+
+        num_jokes, language, tone = self._normalize(num_jokes, language, tone)
+        prompt = prompts.build_batch(contexts, num_jokes, language, tone)
+
+        try:
+            resp = self._post_with_retry(
+                self._payload(prompt, num_jokes * len(contexts), stream=False), stream=False)
+            if resp.status_code != 200:
+                error = f"Ollama error: {resp.status_code}"
+                return [{"success": False, "jokes": [], "raw_response": "", "error": error} for _ in contexts]
+            raw_text = _loads(resp.content).get("response", "")
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+            # ValueError covers a body that isn't JSON (orjson's decode error subclasses it too)
+            return [{"success": False, "jokes": [], "raw_response": "", "error": str(e)} for _ in contexts]
+
+        parts = [p for p in (chunk.strip() for chunk in raw_text.split(prompts.BATCH_SEPARATOR)) if p]
+        if len(parts) != len(contexts):
+            return self.generate_many(contexts, num_jokes, language, tone)
+
+        return [{"success": True, "jokes": self._parse_jokes(part)[:num_jokes], "raw_response": part, "error": None}
+                for part in parts]
+
+    def stream_jokes(self, context: str, num_jokes: int = 3,
+                     language: str = "English", tone: str = "Clean") -> Iterator[str]:
+        # Returns an iterator yielding each joke as soon as Ollama has finished writing it;
+        # raises JokeGeneratorError. Not a generator itself, so the cancel event is in place
+        # before iteration starts and a cancel() right after this call isn't lost
+        if not context or not context.strip():
+            raise JokeGeneratorError("Context cannot be empty.")
+
+        prompt, num_jokes = self._build_prompt(context, num_jokes, language, tone)
+        # Shares the response cache with generate_jokes; a hit is replayed without a request
+        key = self._cache_key(context, num_jokes, language, tone)
+        cached = self._cache_get(key)
+        if cached:
+            return iter(cached["jokes"])
+
+        cancelled = self._cancelled = threading.Event()
+        return self._cancellable(self._stream(prompt, num_jokes, cancelled), cancelled, key, num_jokes)
+
+    def _cancellable(self, jokes: Iterator[str], cancelled: threading.Event,
+                     key: tuple, num_jokes: int) -> Iterator[str]:
+        try:
+            # _stream returns the full response text only when it ran to the end
+            raw_text = yield from jokes
+        except Exception:
+            # Whatever the closed socket raised, a cancelled stream just ends
+            if not cancelled.is_set():
+                raise
+        else:
+            if raw_text and not cancelled.is_set():
+                self._cache_put(key, {"success": True, "jokes": self._parse_jokes(raw_text)[:num_jokes],
+                                      "raw_response": raw_text, "error": None})
+        finally:
+            self._current_response = None
+
+    def _stream(self, prompt: str, num_jokes: int, cancelled: threading.Event) -> Iterator[str]:
+        raw_text = ""
+        emitted = 0
+
+        try:
+            resp = self._post_cancellable(self._payload(prompt, num_jokes, stream=True), cancelled)
+            if resp is None:
+                return
+            with resp:
+                self._current_response = resp
+                if resp.status_code != 200:
+                    raise JokeGeneratorError(f"Ollama error: {resp.status_code}")
+
+                for line in resp.iter_lines():
+                    if cancelled.is_set():
+                        return
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    if "error" in chunk:
+                        raise JokeGeneratorError(f"Ollama error: {chunk['error']}")
+
+                    piece = chunk.get("response", "")
+                    raw_text += piece
+                    if chunk.get("done"):
+                        break
+
+                    # Once a line ends, every joke before the last one is complete
+                    if "\n" in piece and emitted < num_jokes:
+                        finished = self._parse_jokes(raw_text[:raw_text.rfind("\n")])[:-1]
+                        for joke in finished[emitted:num_jokes]:
+                            emitted += 1
+                            yield joke
+
+        except requests.exceptions.ConnectionError:
+            raise JokeGeneratorError("Lost connection to Ollama.")
+        except requests.exceptions.Timeout:
+            raise JokeGeneratorError("Request timed out.")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise JokeGeneratorError(str(e))
+
+        if cancelled.is_set():
+            return
         if not raw_text:
-            return []
+            raise JokeGeneratorError("Empty response from Ollama.")
+
+        yield from self._parse_jokes(raw_text)[emitted:num_jokes]
+        return raw_text
+
+    def _post_cancellable(self, data: bytes, cancelled: threading.Event) -> Optional[requests.Response]:
+        # Headers only arrive with the first token, possibly after a model load, so the POST
+        # runs on a helper thread; on cancel this returns None and a late response is closed
+        lock = threading.Lock()
+        ready = threading.Event()
+        abandoned = threading.Event()
+        outcome = []
 
-        jokes = []
-        current = []
+        def post():
+            try:
+                result = self._post_with_retry(data, stream=True)
+            except BaseException as e:
+                result = e
+            with lock:
+                if abandoned.is_set():
+                    if not isinstance(result, BaseException):
+                        result.close()
+                    return
+                outcome.append(result)
+            ready.set()
 
-        for line in raw_text.strip().split('\n'):
-            line = line.strip()
-            if not line:
-                if current:
-                    jokes.append('\n'.join(current))
-                    current = []
-                continue
+        threading.Thread(target=post, daemon=True).start()
+        while not ready.wait(0.05):
+            if cancelled.is_set():
+                with lock:
+                    if not outcome:
+                        abandoned.set()
+                        return None
+                break
 
-            if line[0].isdigit() or line.startswith('-'):
-                if current:
-                    jokes.append('\n'.join(current))
-                    current = []
+        if isinstance(outcome[0], BaseException):
+            raise outcome[0]
+        return outcome[0]
 
-            current.append(line)
+    def _post_with_retry(self, data: bytes, stream: bool) -> requests.Response:
+        # Only failures to connect are retried. After a read timeout Ollama may still be
+        # generating, and a stream that already started is never replayed
+        for attempt in range(_POST_ATTEMPTS):
+            try:
+                return self.session.post(f"{self.base_url}/api/generate", data=data,
+                                         stream=stream, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout):
+                if attempt == _POST_ATTEMPTS - 1 or self._cancelled.is_set():
+                    raise
+                time.sleep(random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2 ** attempt)))
 
-        if current:
-            jokes.append('\n'.join(current))
+    def _build_prompt(self, context: str, num_jokes: int, language: str, tone: str) -> tuple[str, int]:
+        num_jokes, language, tone = self._normalize(num_jokes, language, tone)
+        return prompts.build(context, num_jokes, language, tone), num_jokes
+
+    def _normalize(self, num_jokes: int, language: str, tone: str) -> tuple[int, str, str]:
+        low, high = self._joke_range
+        num_jokes = max(low, min(num_jokes, high))
+        language = language if language in self._languages else "English"
+        tone = tone if tone in self._tones else "Clean"
+        return num_jokes, language, tone
+
+    def _num_predict(self, num_jokes: int) -> int:
+        return min(self._max_tokens, _TOKENS_PER_JOKE * num_jokes + _OVERHEAD_TOKENS)
+
+    def _payload(self, prompt: str, num_jokes: int, stream: bool) -> bytes:
+        options = {**self._base_payload["options"], "num_predict": self._num_predict(num_jokes)}
+        return _dumps({**self._base_payload, "prompt": prompt, "stream": stream, "options": options})
+
+    def _parse_jokes(self, raw_text: str) -> list[str]:
+        if not raw_text:
+            return []
 
-        # Filter short entries
-        jokes = [j.strip() for j in jokes if len(j.strip()) > 10]
+        parts = _JOKE_BREAK_RE.split(raw_text.strip())
+        jokes = [j for j in (_LINE_EDGE_RE.sub("\n", p).strip() for p in parts) if len(j) > 10]
         return jokes if jokes else [raw_text]
@@ -1,5 +1,16 @@
 # Prompt templates for joke generation
 
+from functools import lru_cache
+from string import Template
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+# Longer contexts skip the cache so one-off inputs can't flood it
+CACHE_MAX_CONTEXT = 512
+
+# Line the model is asked to put between joke sets in a batched prompt
+BATCH_SEPARATOR = "<<<SEP>>>"
+
 SYSTEM = {
     "English": "You are a witty stand-up comedian specializing in clever wordplay and observational humor.",
     "Romanian": "Ești un comedian român cu simț ascuțit, specializat în umor situațional și auto-ironic."
@@ -32,29 +43,84 @@ EXAMPLES = {
 }
 
 
-def build(context: str, num_jokes: int, language: str, tone: str) -> str:
-    lang = language if language in SYSTEM else "English"
-    tone = tone if tone in TONES[lang] else "Clean"
+LABELS = {
+    "English": {
+        "tone": "Tone",
+        "example": "Example",
+        "request": "Generate EXACTLY $num_jokes joke(s) about: $context",
+        "rules": "Exactly $num_jokes jokes, numbered (1., 2., etc.), in English, with blank line between them.",
+        "batch": "Write the $num_jokes joke(s) separately for EACH numbered topic above, in order, "
+                 "and put a line containing only $separator between the sets of different topics.",
+    },
+    "Romanian": {
+        "tone": "Ton",
+        "example": "Exemplu",
+        "request": "Generează EXACT $num_jokes glumă/glume despre: $context",
+        "rules": "Exact $num_jokes glume, numerotate (1., 2., etc.), în română, cu linie goală între ele.",
+        "batch": "Scrie cele $num_jokes glume separat pentru FIECARE subiect numerotat de mai sus, în ordine, "
+                 "și pune o linie care conține doar $separator între seturile de subiecte diferite.",
+    }
+}
 
-    system = SYSTEM[lang]
-    tone_guide = TONES[lang][tone]
-    example = EXAMPLES[lang][tone]
+BODY = """{system}
 
-    if lang == "Romanian":
-        return f"""{system}
+{tone_label}: {tone} - {tone_guide}
+{example_label}: {example}
 
-Ton: {tone} - {tone_guide}
-Exemplu: {example}
+{request}
+
+IMPORTANT: {rules}"""
+
+
+class LangConfig(NamedTuple):
+    system: str
+    tones: Mapping[str, str]
+    examples: Mapping[str, str]
+    labels: Mapping[str, str]
+
+
+# The tables above are baked into _TEMPLATES, so expose them read-only
+PROMPTS = MappingProxyType({
+    lang: LangConfig(
+        system=SYSTEM[lang],
+        tones=MappingProxyType(TONES[lang]),
+        examples=MappingProxyType(EXAMPLES[lang]),
+        labels=MappingProxyType(LABELS[lang]))
+    for lang in SYSTEM
+})
+
+# Everything except context/num_jokes is fixed per (language, tone), so fill it in once
+_TEMPLATES = MappingProxyType({
+    (lang, tone): Template(BODY.format(
+        system=cfg.system, tone=tone, tone_guide=guide, example=cfg.examples[tone],
+        tone_label=cfg.labels["tone"], example_label=cfg.labels["example"],
+        request=cfg.labels["request"], rules=cfg.labels["rules"]))
+    for lang, cfg in PROMPTS.items()
+    for tone, guide in cfg.tones.items()
+})
+
+
+def build(context: str, num_jokes: int, language: str, tone: str) -> str:
+    if len(context) < CACHE_MAX_CONTEXT:
+        return _build_cached(context, num_jokes, language, tone)
+    return _build(context, num_jokes, language, tone)
 
-Generează EXACT {num_jokes} glumă/glume despre: {context}
 
-IMPORTANT: Exact {num_jokes} glume, numerotate (1., 2., etc.), în română, cu linie goală între ele."""
+def _build(context: str, num_jokes: int, language: str, tone: str) -> str:
+    try:
+        template = _TEMPLATES[(language, tone)]
+    except KeyError:
+        lang = language if language in PROMPTS else "English"
+        template = _TEMPLATES[(lang, tone if tone in PROMPTS[lang].tones else "Clean")]
+    return template.safe_substitute(context=context, num_jokes=num_jokes)
 
-    return f"""{system}
 
-Tone: {tone} - {tone_guide}
-Example: {example}
+_build_cached = lru_cache(maxsize=512)(_build)
 
-Generate EXACTLY {num_jokes} joke(s) about: {context}
 
-IMPORTANT: Exactly {num_jokes} jokes, numbered (1., 2., etc.), in English, with blank line between them."""
+def build_batch(contexts: list[str], num_jokes: int, language: str, tone: str) -> str:
+    # The regular prompt over a numbered topic list, plus how to separate the answers
+    topics = "".join(f"\n{i}. {context}" for i, context in enumerate(contexts, 1))
+    lang = language if language in PROMPTS else "English"
+    batch = Template(PROMPTS[lang].labels["batch"]).substitute(num_jokes=num_jokes, separator=BATCH_SEPARATOR)
+    return f"{_build(topics, num_jokes, language, tone)}\n{batch}"
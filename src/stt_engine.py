@@ -1,19 +1,29 @@
 # Speech-to-Text using SpeechRecognition (requires pyaudio)
 
 import threading
+import time
+from functools import lru_cache
+from importlib.util import find_spec
 
-try:
-    import speech_recognition as sr
-    SR_AVAILABLE = True
-except ImportError:
-    SR_AVAILABLE = False
-    sr = None
+# Only located here; speech_recognition (which loads pyaudio) is imported when an engine is built
+SR_AVAILABLE = find_spec("speech_recognition") is not None
+PYAUDIO_AVAILABLE = find_spec("pyaudio") is not None
 
-try:
-    import pyaudio
-    PYAUDIO_AVAILABLE = True
-except ImportError:
-    PYAUDIO_AVAILABLE = False
+
+@lru_cache(maxsize=None)
+def _load_sr():
+    import speech_recognition
+    return speech_recognition
+
+
+# Ambient noise is re-measured at most this often; dynamic_energy_threshold tracks it in between
+_CALIBRATE_EVERY = 60.0
+
+_PYAUDIO_HELP = (
+    "macOS: brew install portaudio && pip install pyaudio\n"
+    "Linux: sudo apt install portaudio19-dev && pip install pyaudio\n"
+    "Windows: pip install pyaudio"
+)
 
 
 class STTEngineError(Exception):
@@ -27,12 +37,12 @@ class STTEngine:
             raise STTEngineError("SpeechRecognition not installed. Run: pip install SpeechRecognition")
 
         if not PYAUDIO_AVAILABLE:
-            raise STTEngineError(
-                "PyAudio not installed.\n"
-                "macOS: brew install portaudio && pip install pyaudio\n"
-                "Linux: sudo apt install portaudio19-dev && pip install pyaudio\n"
-                "Windows: pip install pyaudio"
-            )
+            raise STTEngineError(f"PyAudio not installed.\n{_PYAUDIO_HELP}")
+
+        try:
+            self._sr = sr = _load_sr()
+        except ImportError as e:
+            raise STTEngineError(f"SpeechRecognition failed to load: {e}")
 
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 300
@@ -40,22 +50,34 @@ class STTEngine:
         self.recognizer.pause_threshold = 0.8
         self.is_listening = False
 
-        # Test microphone access
+        # One Microphone for the engine's lifetime; opening it also tests access and calibrates
         try:
-            with sr.Microphone():
-                pass
+            self._mic = sr.Microphone()
+        except (AttributeError, ImportError) as e:
+            # pyaudio is present but fails to import, e.g. libportaudio is missing
+            raise STTEngineError(f"PyAudio failed to load: {e}\n{_PYAUDIO_HELP}")
         except OSError as e:
             raise STTEngineError(f"No microphone found: {e}")
+        try:
+            with self._mic as source:
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        except OSError as e:
+            raise STTEngineError(f"No microphone found: {e}")
+        self._calibrated_at = time.monotonic()
 
     def listen(self, timeout=5.0, phrase_time_limit=10.0, on_result=None, on_error=None):
         if self.is_listening:
             return
 
+        sr = self._sr
+
         def _listen():
             self.is_listening = True
             try:
-                with sr.Microphone() as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                with self._mic as source:
+                    if time.monotonic() - self._calibrated_at > _CALIBRATE_EVERY:
+                        self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                        self._calibrated_at = time.monotonic()
                     audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
 
                 text = self.recognizer.recognize_google(audio)
@@ -1,43 +1,72 @@
 # Text analysis and processing utilities
 
+import heapq
+import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
+from typing import Iterable
 
 STOP_WORDS = {
-    "en": {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
-           "from", "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does",
-           "did", "will", "would", "could", "should", "this", "that", "i", "you", "he", "she", "it",
-           "we", "they", "what", "which", "who", "where", "when", "why", "how", "all", "some", "no",
-           "not", "only", "very", "just", "about", "into", "through", "during", "before", "after"},
-    "ro": {"si", "sau", "dar", "in", "pe", "la", "de", "cu", "din", "pentru", "este", "sunt", "era",
-           "fi", "fost", "am", "ai", "a", "au", "voi", "eu", "tu", "el", "ea", "noi", "ei", "ele",
-           "ce", "care", "cine", "unde", "cand", "cum", "nu", "doar", "foarte", "mai", "un", "o"}
+    "en": frozenset({"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+                     "from", "is", "are", "was", "were", "be", "been", "have", "has", "had", "do", "does",
+                     "did", "will", "would", "could", "should", "this", "that", "i", "you", "he", "she", "it",
+                     "we", "they", "what", "which", "who", "where", "when", "why", "how", "all", "some", "no",
+                     "not", "only", "very", "just", "about", "into", "through", "during", "before", "after"}),
+    "ro": frozenset({"si", "sau", "dar", "in", "pe", "la", "de", "cu", "din", "pentru", "este", "sunt", "era",
+                     "fi", "fost", "am", "ai", "a", "au", "voi", "eu", "tu", "el", "ea", "noi", "ei", "ele",
+                     "ce", "care", "cine", "unde", "cand", "cum", "nu", "doar", "foarte", "mai", "un", "o"})
 }
 
+# Longer texts skip the language cache so one-off inputs can't flood it
+CACHE_MAX_TEXT = 512
+# Below this many distinct texts, starting worker processes costs more than the analysis
+PARALLEL_MIN_TEXTS = 64
+
+# Runs of word characters: the same tokens as blanking punctuation and splitting on whitespace
+_WORD_RE = re.compile(r"\w+")
+_SENTENCE_END_RE = re.compile(r"[.!?]+")
+
+# Marker words as frozensets for direct set intersection; "chars" matches any marker letter
 LANG_PATTERNS = {
-    "en": {"words": ["the", "and", "is", "are", "was", "have", "will"], "chars": []},
-    "ro": {"words": ["si", "este", "sunt", "pentru", "care", "sau"], "chars": ["ă", "î", "ț", "ș"]}
+    "en": {"words": frozenset({"the", "and", "is", "are", "was", "have", "will"}), "chars": None},
+    "ro": {"words": frozenset({"si", "este", "sunt", "pentru", "care", "sau"}), "chars": re.compile("[ăîțș]")}
 }
 
 
 def tokenize(text: str) -> list[str]:
-    if not text:
-        return []
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    return [t for t in text.split() if t]
+    return _WORD_RE.findall(text.lower()) if text else []
+
+
+def context_key(text: str) -> str:
+    # Only case and spacing are ignored; word order, stop words and symbols can change the topic
+    return " ".join(text.lower().split()) if text else ""
 
 
-def detect_language(text: str) -> tuple[str, float]:
+def detect_language(text: str, tokens: Iterable[str] = None) -> tuple[str, float]:
+    # The result depends only on text; tokens just save re-tokenizing on a cache miss
+    if text and len(text) < CACHE_MAX_TEXT:
+        return _detect_language_cached(text)
+    return _detect_language(text, tokens)
+
+
+def _detect_language(text: str, tokens: Iterable[str] = None) -> tuple[str, float]:
     if not text:
         return "en", 0.0
 
-    tokens = set(tokenize(text))
+    tokens = set(tokenize(text) if tokens is None else tokens)
     text_lower = text.lower()
+    # Marker letters are all non-ASCII, so plain ASCII input can't contain any
+    check_chars = not text.isascii()
     scores = {}
 
     for lang, patterns in LANG_PATTERNS.items():
-        score = len(tokens.intersection(patterns["words"])) * 2
-        score += sum(1 for c in patterns["chars"] if c in text_lower)
+        score = len(tokens & patterns["words"]) * 2
+        if check_chars and patterns["chars"]:
+            # Each marker letter counts once, however often it appears
+            score += len(set(patterns["chars"].findall(text_lower)))
         scores[lang] = score
 
     total = sum(scores.values())
@@ -49,29 +78,38 @@ def detect_language(text: str) -> tuple[str, float]:
     return best, min(confidence, 1.0)
 
 
-def extract_keywords(text: str, language: str = "en", top_n: int = 5) -> list[str]:
-    tokens = tokenize(text)
-    if not tokens:
-        return []
+_detect_language_cached = lru_cache(maxsize=256)(_detect_language)
+
 
+def extract_keywords(text: str, language: str = "en", top_n: int = 5, tokens: list[str] = None) -> list[str]:
+    if tokens is None:
+        tokens = tokenize(text)
+    return _keywords_from_counts(Counter(tokens), language, top_n)
+
+
+def _keywords_from_counts(counts: Counter, language: str, top_n: int) -> list[str]:
+    # counts keeps first-occurrence order, so ties rank the same as counting the keywords directly
     stop = STOP_WORDS.get(language, STOP_WORDS["en"])
-    keywords = [t for t in tokens if t not in stop and len(t) > 2]
-    return [w for w, _ in Counter(keywords).most_common(top_n)]
+    keywords = ((t, n) for t, n in counts.items() if t not in stop and len(t) > 2)
+    return [w for w, _ in heapq.nlargest(top_n, keywords, key=itemgetter(1))]
 
 
-def get_text_stats(text: str) -> dict:
-    tokens = tokenize(text)
-    lang, conf = detect_language(text)
+def get_text_stats(text: str, tokens: list[str] = None) -> dict:
+    if tokens is None:
+        tokens = tokenize(text)
+    # One count of the tokens serves unique words, language detection and keywords
+    counts = Counter(tokens)
+    lang, conf = detect_language(text, counts)
 
     return {
         "word_count": len(tokens),
-        "character_count": len(text.replace(" ", "")),
-        "sentence_count": len([s for s in re.split(r'[.!?]+', text) if s.strip()]),
-        "unique_words": len(set(tokens)),
+        "character_count": len(text) - text.count(" "),
+        "sentence_count": len([s for s in _SENTENCE_END_RE.split(text) if s.strip()]),
+        "unique_words": len(counts),
         "average_word_length": round(sum(len(t) for t in tokens) / max(len(tokens), 1), 2),
         "detected_language": lang,
         "language_confidence": round(conf, 2),
-        "keywords": extract_keywords(text, lang)
+        "keywords": _keywords_from_counts(counts, lang, 5)
     }
 
 
@@ -79,11 +117,36 @@ def analyze_input(text: str) -> dict:
     if not text or not text.strip():
         return {"is_valid": False, "error": "Input is empty", "statistics": None}
 
+    # Tokenized and language-detected once, shared by every step below
     text = text.strip()
+    tokens = tokenize(text)
+    stats = get_text_stats(text, tokens)
     return {
         "is_valid": True,
         "error": None,
-        "statistics": get_text_stats(text),
-        "tokens": tokenize(text),
-        "keywords": extract_keywords(text, detect_language(text)[0])
+        "statistics": stats,
+        "tokens": tokens,
+        "keywords": stats["keywords"]
     }
+
+
+def analyze_batch(texts: list[str]) -> list[dict]:
+    # Repeated texts (common in generated batches) are analyzed once and share one result
+    results = {}
+    for text in texts:
+        if text not in results:
+            results[text] = analyze_input(text)
+    return [results[text] for text in texts]
+
+
+def analyze_many(texts: list[str], workers: int = None) -> list[dict]:
+    # Analysis is CPU-bound pure Python, so large batches are spread over processes
+    unique = list(dict.fromkeys(texts))
+    if len(unique) < PARALLEL_MIN_TEXTS:
+        return analyze_batch(texts)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        analyzed = pool.map(analyze_input, unique, chunksize=max(1, len(unique) // (4 * workers)))
+        results = dict(zip(unique, analyzed))
+    return [results[text] for text in texts]
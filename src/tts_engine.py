@@ -1,24 +1,68 @@
+import hashlib
 import os
+import queue
+import re
 import sys
 import tempfile
 import threading
 import subprocess
-from gtts import gTTS
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from importlib.util import find_spec
 from . import config
 
 
+def _user_cache_dir() -> str:
+    # Per-user, so other local users can neither block writes nor plant audio to be played
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "ai_joke_generator", "tts")
+
+
+# Downloaded gTTS audio is kept across runs, oldest files pruned past this size
+_CACHE_DIR = _user_cache_dir()
+_CACHE_MAX_BYTES = 50 * 1024 * 1024
+# Chunks are downloaded on several threads; only one of them prunes at a time
+_CACHE_LOCK = threading.Lock()
+
+
 class TTSEngineError(Exception):
     pass
 
 
 class TTSEngine:
 
-    def __init__(self):
+    def __init__(self, backend: str = config.TTS_BACKEND):
         self.language = "en"
         self.is_playing = False
         self.temp_file = None
         self._process = None
-        self._stop_flag = False
+        # Replaced for each playback, so a late finish of a stopped one can't affect the next
+        self._stopped = threading.Event()
+
+        if backend == "auto":
+            backend = "pyttsx3" if find_spec("pyttsx3") else "gtts"
+        self.backend = backend
+        # pyttsx3 engine, created on first use and kept since initializing it is slow.
+        # Its drivers (SAPI, NSSpeechSynthesizer) are thread-bound, so one thread owns it
+        self._engine = None
+        self._local_jobs = queue.Queue()
+        if backend == "pyttsx3":
+            threading.Thread(target=self._local_worker, daemon=True).start()
+        # Local speech is rewritten in place at one path instead of a new temp file per play
+        self._temp_base = os.path.join(tempfile.gettempdir(), f"ai_joke_tts_{os.getpid()}")
+
+        # Parallel gTTS downloads for play_stream; shut down (pending ones cancelled) by stop()
+        self._downloads = None
+
+        # mpg123 in remote-control mode, started once and sent a LOAD per playback
+        self._player = None
+        self._player_lock = threading.Lock()
+        self._player_idle = threading.Event()
+        self._player_idle.set()
 
     def set_language(self, language: str):
         self.language = config.TTS_LANGUAGES.get(language, "en")
@@ -30,28 +74,21 @@ class TTSEngine:
             raise TTSEngineError("Cannot convert empty text.")
 
         try:
-            # Generate audio
-            tts = gTTS(text=text, lang=self.language, slow=False)
-            self._cleanup_temp()
-            self.temp_file = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False).name
-            tts.save(self.temp_file)
+            # Generate audio, on-device when possible; gTTS is the fallback
+            if not (self.backend == "pyttsx3" and self._synthesize_local(text)):
+                self.temp_file = self._gtts_path(text)
 
             # Play in background
-            self._stop_flag = False
+            stopped = self._stopped = threading.Event()
             self.is_playing = True
 
             def play_audio():
                 try:
-                    cmd = self._get_player_cmd()
-                    self._process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    self._process.wait()
+                    self._play_file(self.temp_file, stopped)
                 except Exception:
                     pass
                 finally:
-                    self.is_playing = False
-                    self._process = None
-                    if not self._stop_flag and on_complete:
-                        on_complete()
+                    self._finish(stopped, on_complete)
 
             threading.Thread(target=play_audio, daemon=True).start()
             return True
@@ -59,32 +96,218 @@ class TTSEngine:
         except Exception as e:
             raise TTSEngineError(f"TTS failed: {e}")
 
-    def _get_player_cmd(self) -> list:
+    def play_stream(self, text: str, on_complete=None, sep: str = " ... ") -> bool:
+        # gTTS chunks download in parallel; each plays as soon as it and those before it are ready
+        chunks = [c for c in text.split(sep) if c.strip()] if text else []
+        if self.backend == "pyttsx3" or len(chunks) < 2:
+            return self.play(text, on_complete)
+
+        self.stop()
+        stopped = self._stopped = threading.Event()
+        pool = self._downloads = ThreadPoolExecutor(max_workers=4, thread_name_prefix="tts")
+        try:
+            # A stop() from another thread may already have shut the pool down
+            futures = [pool.submit(self._gtts_chunk, chunk, stopped) for chunk in chunks]
+            futures[0].result()
+        except (Exception, CancelledError) as e:
+            raise TTSEngineError(f"TTS failed: {e}")
+
+        self.is_playing = True
+
+        def play_chunks():
+            try:
+                for future in futures:
+                    if stopped.is_set():
+                        break
+                    self._play_file(future.result(), stopped)
+            except (Exception, CancelledError):
+                pass
+            finally:
+                self._finish(stopped, on_complete)
+
+        threading.Thread(target=play_chunks, daemon=True).start()
+        return True
+
+    def _gtts_chunk(self, text: str, stopped: threading.Event):
+        # Downloads queued before a stop are skipped rather than fetched for nothing
+        return None if stopped.is_set() else self._gtts_path(text)
+
+    def _play_file(self, path: str, stopped: threading.Event):
+        if sys.platform not in ("darwin", "win32") and path.endswith(".mp3"):
+            self._play_remote(path, stopped)
+        else:
+            self._process = subprocess.Popen(self._get_player_cmd(path),
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._process.wait()
+
+    def _finish(self, stopped: threading.Event, on_complete):
+        if not stopped.is_set():
+            self.is_playing = False
+            self._process = None
+            if on_complete:
+                on_complete()
+
+    def _gtts_path(self, text: str) -> str:
+        # The same text in the same language is played from disk instead of downloaded again
+        key = hashlib.sha256(f"{self.language}\0{text}".encode()).hexdigest()
+        path = os.path.join(_CACHE_DIR, f"{key}.mp3")
+        try:
+            os.utime(path)
+            return path
+        except FileNotFoundError:
+            pass
+
+        # gtts is imported on first use, not at app startup
+        from gtts import gTTS
+        os.makedirs(_CACHE_DIR, mode=0o700, exist_ok=True)
+        # Each download gets its own temp file, so two of the same text can't interleave
+        fd, part = tempfile.mkstemp(suffix=".part", dir=_CACHE_DIR)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                gTTS(text=text, lang=self.language, slow=False).write_to_fp(f)
+            os.replace(part, path)
+        except BaseException:
+            try:
+                os.remove(part)
+            except OSError:
+                pass
+            raise
+        self._prune_cache()
+        return path
+
+    def _prune_cache(self):
+        with _CACHE_LOCK:
+            entries = []
+            for entry in os.scandir(_CACHE_DIR):
+                if not entry.name.endswith(".mp3"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries[:-1]:
+                if total <= _CACHE_MAX_BYTES:
+                    break
+                total -= size
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _synthesize_local(self, text: str) -> bool:
+        reply = queue.Queue(maxsize=1)
+        self._local_jobs.put((text, reply))
+        if not reply.get():
+            return False
+        self.temp_file = self._temp_base + ".wav"
+        return True
+
+    def _local_worker(self):
+        while True:
+            text, reply = self._local_jobs.get()
+            reply.put(self._render_local(text))
+
+    def _render_local(self, text: str) -> bool:
+        path = self._temp_base + ".wav"
+        try:
+            if self._engine is None:
+                import pyttsx3
+                self._engine = pyttsx3.init()
+            if not self._select_voice():
+                return False
+            # A failed render must not leave the previous joke's audio to be played again
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._engine.save_to_file(text, path)
+            self._engine.runAndWait()
+            return os.path.getsize(path) > 0
+        except Exception:
+            return False
+
+    def _select_voice(self) -> bool:
+        # Match "ro" as a whole tag so e.g. "roa/fr" isn't taken for Romanian.
+        # Without a voice for the language, gTTS reads it instead of the default voice
+        for voice in self._engine.getProperty("voices"):
+            tags = re.split(r"[^a-z]+", f"{voice.languages} {voice.id}".lower())
+            if self.language in tags:
+                self._engine.setProperty("voice", voice.id)
+                return True
+        return False
+
+    def _play_remote(self, path: str, stopped: threading.Event):
+        with self._player_lock:
+            if stopped.is_set():
+                return
+            if self._player is None or self._player.poll() is not None:
+                self._player = subprocess.Popen(["mpg123", "-R"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                                stderr=subprocess.DEVNULL, text=True, bufsize=1)
+                threading.Thread(target=self._watch_player, args=(self._player,), daemon=True).start()
+            self._player_idle.clear()
+            self._player.stdin.write(f"LOAD {path}\n")
+            self._player.stdin.flush()
+        self._player_idle.wait()
+
+    def _watch_player(self, player: subprocess.Popen):
+        # "@P 0" means playback finished or was stopped, "@E" that the file couldn't be played
+        try:
+            for line in player.stdout:
+                if line.startswith(("@P 0", "@E")):
+                    self._player_idle.set()
+        finally:
+            self._player_idle.set()
+            player.wait()
+
+    def _get_player_cmd(self, path: str) -> list:
         if sys.platform == "darwin":
-            return ["afplay", self.temp_file]
+            return ["afplay", path]
         elif sys.platform == "win32":
-            return ["powershell", "-c", f"(New-Object Media.SoundPlayer '{self.temp_file}').PlaySync()"]
-        return ["mpg123", "-q", self.temp_file]
+            return ["powershell", "-c", f"(New-Object Media.SoundPlayer '{path}').PlaySync()"]
+        if path.endswith(".wav"):
+            return ["aplay", "-q", path]
+        return ["mpg123", "-q", path]
 
     def stop(self):
-        self._stop_flag = True
+        self._stopped.set()
+        with self._player_lock:
+            if not self._player_idle.is_set():
+                try:
+                    self._player.stdin.write("STOP\n")
+                    self._player.stdin.flush()
+                except (OSError, ValueError):
+                    self._player_idle.set()
+        self._player_idle.wait(timeout=1)
         if self._process and self._process.poll() is None:
             self._process.terminate()
             try:
                 self._process.wait(timeout=1)
             except subprocess.TimeoutExpired:
                 self._process.kill()
+        if self._downloads:
+            self._downloads.shutdown(wait=False, cancel_futures=True)
+            self._downloads = None
         self.is_playing = False
         self._process = None
 
     def _cleanup_temp(self):
-        if self.temp_file and os.path.exists(self.temp_file):
-            try:
-                os.remove(self.temp_file)
-            except OSError:
-                pass
-            self.temp_file = None
+        # Cached gTTS files are kept; only this process's own output is removed
+        try:
+            os.remove(self._temp_base + ".wav")
+        except OSError:
+            pass
+        self.temp_file = None
 
     def cleanup(self):
         self.stop()
+        if self._player and self._player.poll() is None:
+            try:
+                self._player.stdin.write("QUIT\n")
+                self._player.stdin.flush()
+            except (OSError, ValueError):
+                self._player.terminate()
+        self._player = None
         self._cleanup_temp()
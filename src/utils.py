@@ -1,8 +1,17 @@
 import os
 import re
+import string
 from datetime import datetime
 from . import config
 
+# Characters that make a context meaningful: ASCII letters/digits and Latin Extended-A (ă, ș, ț...)
+_CONTEXT_CHARS = frozenset(string.ascii_letters + string.digits + "".join(map(chr, range(0x100, 0x180))))
+
+# Compiled once; these run for every joke shown, spoken or saved
+_LEADING_NUMBER_RE = re.compile(r'^\d+[.)\-:]\s*')
+# Leading number and markdown characters removed in one pass for speech
+_TTS_STRIP_RE = re.compile(r'^\d+[.)\-:]\s*|[*_#~`]')
+
 
 def validate_context(context: str) -> tuple[bool, str]:
     if not context:
@@ -13,35 +22,28 @@ def validate_context(context: str) -> tuple[bool, str]:
         return False, "Context must be at least 2 characters."
     if len(context) > 500:
         return False, "Context must not exceed 500 characters."
-    if re.match(r'^[^a-zA-Z0-9\u0100-\u017F]+$', context):
+    if _CONTEXT_CHARS.isdisjoint(context):
         return False, "Context must contain some letters or numbers."
 
     return True, ""
 
 
-def format_jokes_for_display(jokes: list[str]) -> str:
+def _strip_number(joke: str) -> str:
+    return _LEADING_NUMBER_RE.sub('', joke.strip())
+
+
+def format_jokes_for_display(jokes: list[str], start: int = 1) -> str:
     if not jokes:
         return "No jokes generated."
 
-    parts = []
-    for i, joke in enumerate(jokes, 1):
-        joke = re.sub(r'^\d+[.)\-:]\s*', '', joke.strip())
-        parts.append(f"{i}. {joke}")
-
-    return "\n\n".join(parts)
+    return "\n\n".join(f"{i}. {_strip_number(joke)}" for i, joke in enumerate(jokes, start))
 
 
 def format_jokes_for_tts(jokes: list[str]) -> str:
     if not jokes:
         return ""
 
-    parts = []
-    for i, joke in enumerate(jokes, 1):
-        joke = re.sub(r'^\d+[.)\-:]\s*', '', joke.strip())
-        joke = re.sub(r'[*_#~`]', '', joke)
-        parts.append(f"Joke number {i}. {joke}")
-
-    return " ... ".join(parts)
+    return " ... ".join(f"Joke number {i}. {_TTS_STRIP_RE.sub('', joke.strip())}" for i, joke in enumerate(jokes, 1))
 
 
 def save_jokes_to_file(jokes: list[str], filepath: str = None,
@@ -54,14 +56,15 @@ def save_jokes_to_file(jokes: list[str], filepath: str = None,
         filepath = f"jokes_{timestamp}.txt"
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"AI Joke Generator - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Language: {language} | Context: {context}\n")
-            f.write("-" * 40 + "\n\n")
+        parts = [
+            f"AI Joke Generator - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            f"Language: {language} | Context: {context}\n",
+            "-" * 40 + "\n\n",
+        ]
+        parts.extend(f"{i}. {_strip_number(joke)}\n\n" for i, joke in enumerate(jokes, 1))
 
-            for i, joke in enumerate(jokes, 1):
-                joke = re.sub(r'^\d+[.)\-:]\s*', '', joke.strip())
-                f.write(f"{i}. {joke}\n\n")
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write("".join(parts))
 
         return True, os.path.abspath(filepath)
     except OSError as e: